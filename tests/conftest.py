@@ -0,0 +1,101 @@
+"""
+Shared fixtures for the Mergington High School Activities API tests
+"""
+import copy
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app import activities, app
+
+APP_SOURCE = Path(sys.modules["app"].__file__)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--use-response-cache",
+        action="store_true",
+        default=False,
+        help="Reuse read-only GET payloads recorded in .pytest_cache while src/app.py is unchanged",
+    )
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """A single AsyncClient bound to the app, shared by the whole session"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def cached_get(request, client):
+    """Return an async GET helper yielding parsed JSON for read-only requests
+
+    With --use-response-cache, payloads are kept in pytest's cache directory
+    under one key per URL, tagged with a hash of src/app.py, so they survive
+    across runs until the app changes. Without the flag, or when the cache
+    provider is disabled, every call goes to the app.
+    """
+    cache = getattr(request.config, "cache", None)
+    if cache is None or not request.config.getoption("--use-response-cache"):
+        async def get(url):
+            return (await client.get(url)).json()
+        return get
+
+    version = hashlib.sha256(APP_SOURCE.read_bytes()).hexdigest()[:16]
+
+    async def get(url):
+        key = f"response_cache{url}"
+        entry = cache.get(key, None)
+        if entry is None or entry.get("version") != version:
+            entry = {"version": version, "payload": (await client.get(url)).json()}
+            cache.set(key, entry)
+        return entry["payload"]
+    return get
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def activities_snapshot(cached_get):
+    """Parsed GET /activities payload, fetched once per module for read-only checks"""
+    return await cached_get("/activities")
+
+
+@pytest.fixture
+def activities_dict():
+    """The app's live in-memory activities database"""
+    return activities
+
+
+@pytest.fixture
+def fresh_email(request):
+    """An email address unique to the running test, derived from its node name"""
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '-', request.node.name)}@test.com"
+
+
+@pytest.fixture
+def signed_up(activities_dict):
+    """Return a helper that enrolls an email directly, bypassing the signup endpoint"""
+    def _sign_up(activity, email):
+        activities_dict[activity]["participants"].append(email)
+        return email
+    return _sign_up
+
+
+@pytest.fixture
+def activities_baseline():
+    """Deep copy of the activities database as it was when the test started"""
+    return copy.deepcopy(activities)
+
+
+@pytest.fixture(autouse=True)
+def _reset_activities(activities_baseline):
+    """Restore the in-memory activities database after every test"""
+    yield
+    activities.clear()
+    activities.update(activities_baseline)
@@ -1,222 +1,162 @@
 """
 Test suite for Mergington High School Activities API
 """
+import asyncio
+from urllib.parse import quote
+
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from app import activities, app
+
+ACTIVITY_NAMES = list(activities)
+MISSING_ACTIVITY = "Nonexistent Activity"
+REQUIRED_FIELDS = frozenset({"description", "schedule", "max_participants", "participants"})
+
+# Percent-encoded endpoint paths, built once per activity name
+SIGNUP = {name: f"/activities/{quote(name)}/signup" for name in [*ACTIVITY_NAMES, MISSING_ACTIVITY]}
+UNREGISTER = {name: f"/activities/{quote(name)}/unregister" for name in [*ACTIVITY_NAMES, MISSING_ACTIVITY]}
 
-from app import app
 
-client = TestClient(app)
+async def get_activities(client):
+    """Fetch and parse the current activities payload"""
+    return (await client.get("/activities")).json()
 
 
 class TestActivitiesEndpoint:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities(self):
+    async def test_get_activities(self, client):
         """Test retrieving all activities"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         
         data = response.json()
         assert isinstance(data, dict)
-        assert len(data) > 0
-        
-        # Check structure of an activity
-        for activity_name, activity_data in data.items():
-            assert "description" in activity_data
-            assert "schedule" in activity_data
-            assert "max_participants" in activity_data
-            assert "participants" in activity_data
-            assert isinstance(activity_data["participants"], list)
+        assert list(data) == ACTIVITY_NAMES
 
-    def test_activities_have_required_fields(self):
+    @pytest.mark.parametrize("activity_name", ACTIVITY_NAMES)
+    async def test_activities_have_required_fields(self, activities_snapshot, activity_name):
         """Test that all activities have required fields"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        required_fields = ["description", "schedule", "max_participants", "participants"]
-        for activity_name, activity_data in data.items():
-            for field in required_fields:
-                assert field in activity_data, f"Activity {activity_name} missing {field}"
+        activity_data = activities_snapshot[activity_name]
+        assert REQUIRED_FIELDS <= activity_data.keys(), \
+            f"Activity {activity_name} missing {REQUIRED_FIELDS - activity_data.keys()}"
+
+    @pytest.mark.parametrize("activity_name", ACTIVITY_NAMES)
+    async def test_participants_is_list(self, activities_snapshot, activity_name):
+        """Test that every activity lists its participants"""
+        assert isinstance(activities_snapshot[activity_name]["participants"], list)
 
 
 class TestSignupEndpoint:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_success(self):
+    async def test_signup_success(self, client, fresh_email):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=student@test.com"
+        response = await client.post(
+            SIGNUP["Chess Club"], params={"email": fresh_email}
         )
         assert response.status_code == 200
         
         data = response.json()
         assert "message" in data
-        assert "student@test.com" in data["message"]
+        assert fresh_email in data["message"]
         assert "Chess Club" in data["message"]
 
-    def test_signup_adds_participant(self):
+    async def test_signup_adds_participant(self, client, activities_dict, activities_baseline, fresh_email):
         """Test that signup actually adds the participant"""
-        # Get initial participants
-        initial_response = client.get("/activities")
-        initial_participants = initial_response.json()["Chess Club"]["participants"].copy()
+        initial_len = len(activities_baseline["Chess Club"]["participants"])
         
         # Sign up
-        test_email = "newstudent@test.com"
-        signup_response = client.post(
-            f"/activities/Chess%20Club/signup?email={test_email}"
+        signup_response = await client.post(
+            SIGNUP["Chess Club"], params={"email": fresh_email}
         )
         assert signup_response.status_code == 200
         
         # Verify participant was added
-        updated_response = client.get("/activities")
-        updated_participants = updated_response.json()["Chess Club"]["participants"]
-        assert test_email in updated_participants
-        assert len(updated_participants) == len(initial_participants) + 1
+        updated_participants = activities_dict["Chess Club"]["participants"]
+        assert fresh_email in updated_participants
+        assert len(updated_participants) == initial_len + 1
 
-    def test_signup_duplicate_student(self):
+    async def test_signup_duplicate_student(self, client, fresh_email):
         """Test that a student cannot sign up twice for the same activity"""
-        email = "duplicate@test.com"
+        email = fresh_email
         
         # First signup
-        response1 = client.post(
-            f"/activities/Programming%20Class/signup?email={email}"
+        response1 = await client.post(
+            SIGNUP["Programming Class"], params={"email": email}
         )
         assert response1.status_code == 200
         
         # Try to sign up again
-        response2 = client.post(
-            f"/activities/Programming%20Class/signup?email={email}"
+        response2 = await client.post(
+            SIGNUP["Programming Class"], params={"email": email}
         )
         assert response2.status_code == 400
-        assert "already signed up" in response2.json()["detail"]
-
-    def test_signup_nonexistent_activity(self):
-        """Test signup for an activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent%20Activity/signup?email=student@test.com"
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
+        assert "already signed up" in response2.text
 
     def test_signup_invalid_email(self):
-        """Test signup with various email formats"""
-        # This tests that the endpoint accepts the parameter
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=noemail"
-        )
-        # FastAPI doesn't validate email format by default without a validator
-        assert response.status_code == 200
+        """Test that the signup email is accepted as a plain, unvalidated string"""
+        route = next(r for r in app.routes if getattr(r, "path", "").endswith("/signup"))
+        email_param = next(p for p in route.dependant.query_params if p.name == "email")
+        # FastAPI doesn't validate email format without an EmailStr annotation
+        assert email_param.field_info.annotation is str
 
-    def test_signup_different_activities(self):
+    async def test_signup_different_activities(self, client, activities_dict, fresh_email):
         """Test that a student can sign up for multiple different activities"""
-        email = "multi@test.com"
+        email = fresh_email
         
-        response1 = client.post(
-            f"/activities/Chess%20Club/signup?email={email}"
+        # The two signups are independent, so issue them together
+        response1, response2 = await asyncio.gather(
+            client.post(SIGNUP["Chess Club"], params={"email": email}),
+            client.post(SIGNUP["Drama Club"], params={"email": email}),
         )
         assert response1.status_code == 200
-        
-        response2 = client.post(
-            f"/activities/Drama%20Club/signup?email={email}"
-        )
         assert response2.status_code == 200
         
         # Verify in both activities
-        activities = client.get("/activities").json()
-        assert email in activities["Chess Club"]["participants"]
-        assert email in activities["Drama Club"]["participants"]
+        assert email in activities_dict["Chess Club"]["participants"]
+        assert email in activities_dict["Drama Club"]["participants"]
 
 
 class TestUnregisterEndpoint:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_success(self):
-        """Test successful unregistration from an activity"""
-        email = "unregister@test.com"
-        
-        # First sign up
-        client.post(
-            f"/activities/Tennis%20Club/signup?email={email}"
-        )
-        
-        # Then unregister
-        response = client.delete(
-            f"/activities/Tennis%20Club/unregister?email={email}"
-        )
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert email in data["message"]
-        assert "Unregistered" in data["message"]
-
-    def test_unregister_removes_participant(self):
-        """Test that unregister actually removes the participant"""
-        email = "remove@test.com"
-        
-        # Sign up
-        client.post(
-            f"/activities/Gym%20Class/signup?email={email}"
-        )
-        
-        # Get count before unregister
-        before = client.get("/activities").json()["Gym Class"]["participants"]
-        assert email in before
-        initial_count = len(before)
+    @pytest.mark.parametrize("activity,setup,expected_code,expected_detail", [
+        ("Tennis Club", "signed_up", 200, "Unregistered"),
+        ("Basketball Team", None, 400, "not signed up"),
+        ("Robotics Club", "unregistered", 400, "not signed up"),
+    ])
+    async def test_unregister_matrix(self, client, activities_dict, activities_baseline, signed_up,
+                                     fresh_email, activity, setup, expected_code, expected_detail):
+        """Test unregister outcomes: signed up, never signed up, already unregistered"""
+        if setup is not None:
+            signed_up(activity, fresh_email)
+        if setup == "unregistered":
+            response = await client.delete(UNREGISTER[activity], params={"email": fresh_email})
+            assert response.status_code == 200
         
-        # Unregister
-        response = client.delete(
-            f"/activities/Gym%20Class/unregister?email={email}"
-        )
-        assert response.status_code == 200
+        response = await client.delete(UNREGISTER[activity], params={"email": fresh_email})
+        assert response.status_code == expected_code
+        assert expected_detail in response.text
+        if expected_code == 200:
+            assert fresh_email in response.text
         
-        # Verify participant was removed
-        after = client.get("/activities").json()["Gym Class"]["participants"]
-        assert email not in after
-        assert len(after) == initial_count - 1
+        # Either way the student ends up absent and the roster is back to baseline
+        assert activities_dict[activity]["participants"] == activities_baseline[activity]["participants"]
 
-    def test_unregister_nonexistent_activity(self):
-        """Test unregister from an activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent%20Activity/unregister?email=student@test.com"
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
 
-    def test_unregister_not_signed_up(self):
-        """Test unregister when student is not signed up"""
-        response = client.delete(
-            "/activities/Basketball%20Team/unregister?email=notsigndup@test.com"
-        )
-        assert response.status_code == 400
-        assert "not signed up" in response.json()["detail"]
+class TestNonexistentActivity:
+    """Tests for endpoints addressing an activity that doesn't exist"""
 
-    def test_unregister_twice(self):
-        """Test that a student cannot unregister twice"""
-        email = "twiceunreg@test.com"
-        
-        # Sign up
-        client.post(
-            f"/activities/Robotics%20Club/signup?email={email}"
-        )
-        
-        # First unregister
-        response1 = client.delete(
-            f"/activities/Robotics%20Club/unregister?email={email}"
-        )
-        assert response1.status_code == 200
-        
-        # Try to unregister again
-        response2 = client.delete(
-            f"/activities/Robotics%20Club/unregister?email={email}"
-        )
-        assert response2.status_code == 400
+    @pytest.mark.parametrize("method,path", [
+        ("post", SIGNUP[MISSING_ACTIVITY]),
+        ("delete", UNREGISTER[MISSING_ACTIVITY]),
+    ])
+    async def test_nonexistent_activity(self, client, method, path, fresh_email):
+        """Test signup and unregister for an activity that doesn't exist"""
+        response = await getattr(client, method)(path, params={"email": fresh_email})
+        assert response.status_code == 404
+        assert "Activity not found" in response.text
 
 
 class TestRootEndpoint:
@@ -224,7 +164,9 @@ class TestRootEndpoint:
 
     def test_root_redirect(self):
         """Test that root endpoint redirects to static/index.html"""
-        response = client.get("/", follow_redirects=False)
+        root_route = next(r for r in app.routes if getattr(r, "path", None) == "/")
+        # root() is a plain function returning the response, so call it directly
+        response = root_route.endpoint()
         assert response.status_code == 307  # Redirect status
         assert response.headers["location"] == "/static/index.html"
 
@@ -232,54 +174,48 @@ class TestRootEndpoint:
 class TestParticipantManagement:
     """Integration tests for participant management"""
 
-    def test_signup_and_unregister_workflow(self):
+    async def test_signup_and_unregister_workflow(self, client, activities_baseline, fresh_email):
         """Test complete workflow of signing up and unregistering"""
-        email = "workflow@test.com"
-        activity = "Art%20Studio"
-        
-        # Initial check
-        activities = client.get("/activities").json()
-        initial_count = len(activities["Art Studio"]["participants"])
+        email = fresh_email
+        activity = "Art Studio"
+        initial_count = len(activities_baseline[activity]["participants"])
         
         # Sign up
-        signup_response = client.post(f"/activities/{activity}/signup?email={email}")
+        signup_response = await client.post(SIGNUP[activity], params={"email": email})
         assert signup_response.status_code == 200
         
         # Verify signup
-        activities = client.get("/activities").json()
-        assert email in activities["Art Studio"]["participants"]
-        assert len(activities["Art Studio"]["participants"]) == initial_count + 1
+        participants = (await get_activities(client))[activity]["participants"]
+        assert email in participants
+        assert len(participants) == initial_count + 1
         
         # Unregister
-        unregister_response = client.delete(f"/activities/{activity}/unregister?email={email}")
+        unregister_response = await client.delete(UNREGISTER[activity], params={"email": email})
         assert unregister_response.status_code == 200
         
         # Verify unregister
-        activities = client.get("/activities").json()
-        assert email not in activities["Art Studio"]["participants"]
-        assert len(activities["Art Studio"]["participants"]) == initial_count
+        participants = (await get_activities(client))[activity]["participants"]
+        assert email not in participants
+        assert len(participants) == initial_count
 
-    def test_multiple_participants_management(self):
+    async def test_multiple_participants_management(self, client, activities_baseline, fresh_email):
         """Test managing multiple participants in an activity"""
-        activity = "Debate%20Team"
-        emails = [f"debate{i}@test.com" for i in range(3)]
+        activity = "Debate Team"
+        emails = [f"{i}-{fresh_email}" for i in range(3)]
         
-        # Sign up multiple students
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
-        
-        # Verify all are signed up
-        activities = client.get("/activities").json()
-        for email in emails:
-            assert email in activities["Debate Team"]["participants"]
+        # Sign up multiple students concurrently
+        responses = await asyncio.gather(
+            *(client.post(SIGNUP[activity], params={"email": email}) for email in emails)
+        )
+        assert all(response.status_code == 200 for response in responses)
         
-        # Remove one
-        response = client.delete(f"/activities/{activity}/unregister?email={emails[0]}")
+        # Remove one; a 200 here also confirms it had been signed up
+        response = await client.delete(UNREGISTER[activity], params={"email": emails[0]})
         assert response.status_code == 200
         
         # Verify only that one was removed
-        activities = client.get("/activities").json()
-        assert emails[0] not in activities["Debate Team"]["participants"]
-        assert emails[1] in activities["Debate Team"]["participants"]
-        assert emails[2] in activities["Debate Team"]["participants"]
+        participants = (await get_activities(client))[activity]["participants"]
+        assert emails[0] not in participants
+        assert emails[1] in participants
+        assert emails[2] in participants
+        assert len(participants) == len(activities_baseline[activity]["participants"]) + 2